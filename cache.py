@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from functools import lru_cache
+from time import time
+from typing import Any, Awaitable, Callable, Optional
+import orjson
+from cachetools import LRUCache
+from fastapi import Request
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# ─── Caching ────────────────────────────────────────────────────────────────
+#
+# Ranking-style data only changes when a new snapshot lands (once per day), so
+# hot read endpoints are served from an in-process LRU of (stored_at, value).
+# TTLs follow each endpoint's update cadence: rankings CACHE_TTL (5 min),
+# trending 10 min, tournaments 1 h, search 1 min. Fresh for the TTL, then
+# served stale for CACHE_STALE more seconds while one background task
+# refreshes it. A per-key lock keeps concurrent misses from stampeding
+# Supabase.
+#
+# With REDIS_URL set, misses consult a Redis tier shared by every worker
+# before going to Supabase, so each snapshot is fetched once per fleet rather
+# than once per worker. `PUBLISH cache:invalidate <prefix>` (e.g. "v1:ranking")
+# drops matching entries from Redis and from every worker's LRU.
+
+CACHE_TTL = 300
+CACHE_STALE = 60
+CACHE_NAMESPACE = "v1"
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+_cache: LRUCache = LRUCache(maxsize=1024)
+_cache_locks: LRUCache = LRUCache(maxsize=1024)
+_cache_refreshes: dict = {}
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> Optional[Redis]:
+    """The shared Redis client, created on first use; None when REDIS_URL is unset."""
+    url = get_settings().redis_url
+    return Redis.from_url(url) if url else None
+
+
+def _cache_key(parts: tuple) -> str:
+    return ":".join((CACHE_NAMESPACE, *map(str, parts)))
+
+
+async def _shared_get(key: str) -> Optional[tuple]:
+    redis_client = get_redis()
+    if redis_client is None:
+        return None
+    try:
+        raw = await redis_client.get(key)
+    except RedisError:
+        logger.warning("Redis GET failed for %s", key, exc_info=True)
+        return None
+    return None if raw is None else tuple(orjson.loads(raw))
+
+
+async def _shared_set(key: str, entry: tuple, ttl: float) -> None:
+    redis_client = get_redis()
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(key, orjson.dumps(entry), ex=max(1, int(ttl)))
+    except RedisError:
+        logger.warning("Redis SET failed for %s", key, exc_info=True)
+
+
+async def _cache_load(key: str, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+    lock = _cache_locks.get(key)
+    if lock is None:
+        lock = _cache_locks[key] = asyncio.Lock()
+    async with lock:
+        entry = _cache.get(key)
+        if entry is not None and time() - entry[0] < ttl:
+            return entry[1]  # filled by another caller while we waited
+        entry = await _shared_get(key)
+        if entry is None or time() - entry[0] >= ttl:
+            entry = (time(), await loader())
+            await _shared_set(key, entry, ttl)
+        _cache[key] = entry
+        return entry[1]
+
+
+async def _cache_refresh(key: str, loader: Callable[[], Awaitable[Any]], ttl: float) -> None:
+    try:
+        await _cache_load(key, loader, ttl)
+    except Exception:
+        logger.exception("Background refresh failed for %r; keeping stale entry", key)
+    finally:
+        _cache_refreshes.pop(key, None)
+
+
+async def cached(key: tuple, loader: Callable[[], Awaitable[Any]], ttl: float = CACHE_TTL) -> Any:
+    """Return the cached value for `key`, calling `loader()` on a miss."""
+    key = _cache_key(key)
+    entry = _cache.get(key)
+    if entry is not None:
+        stored_at, value = entry
+        age = time() - stored_at
+        if age < ttl:
+            return value
+        if age < ttl + CACHE_STALE:
+            if key not in _cache_refreshes:
+                _cache_refreshes[key] = asyncio.create_task(_cache_refresh(key, loader, ttl))
+            return value
+    return await _cache_load(key, loader, ttl)
+
+
+async def invalidate(prefix: str) -> None:
+    """Drop every cache entry whose key starts with `prefix`, locally and in Redis."""
+    for key in [k for k in _cache.keys() if k.startswith(prefix)]:
+        _cache.pop(key, None)
+    redis_client = get_redis()
+    if redis_client is not None:
+        async for key in redis_client.scan_iter(match=f"{prefix}*"):
+            await redis_client.delete(key)
+
+
+async def listen_for_invalidations() -> None:
+    """Background task: apply prefixes published on INVALIDATION_CHANNEL."""
+    while True:
+        try:
+            async with get_redis().pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        await invalidate(message["data"].decode())
+        except RedisError:
+            logger.warning("Cache invalidation listener lost Redis; retrying", exc_info=True)
+            await asyncio.sleep(5)
+
+
+# ─── Conditional Requests ───────────────────────────────────────────────────
+#
+# Snapshot-keyed responses carry an ETag derived from the snapshot date of
+# the rows being served and the request params, plus Last-Modified; other
+# cached payloads (tournaments) hash the body instead. A client or CDN
+# revalidating with If-None-Match gets a bodiless 304; while the payload is
+# cached that costs no Supabase round trip. ETags are weak (W/) because
+# GZipMiddleware may re-encode the body, so they promise semantic, not
+# byte-for-byte, equivalence. The same headers go on the 200 and the 304,
+# including Vary: Accept-Encoding, which a 304 must repeat (RFC 9110 15.4.5).
+
+
+def cache_control(ttl: int = CACHE_TTL, shared_ttl: Optional[int] = None, stale: int = CACHE_STALE) -> str:
+    """
+    Cache-Control letting clients and CDNs reuse a response for as long as we cache it.
+    `shared_ttl` sets s-maxage, the lifetime for CDNs; keep it >= `ttl`.
+    """
+    shared = f", s-maxage={shared_ttl}" if shared_ttl is not None else ""
+    return f"public, max-age={ttl}{shared}, stale-while-revalidate={stale}"
+
+
+def _weak_etag(data: bytes) -> str:
+    return f'W/"{hashlib.blake2s(data, digest_size=16).hexdigest()}"'
+
+
+def snapshot_headers(snapshot_date: Optional[str], *parts: Any, ttl: int = CACHE_TTL) -> dict:
+    """Validator and caching headers for a response built from `snapshot_date`."""
+    etag = _weak_etag(":".join(map(str, (snapshot_date, *parts))).encode())
+    headers = {"ETag": etag, "Cache-Control": cache_control(ttl), "Vary": "Accept-Encoding"}
+    if snapshot_date:
+        modified = datetime.fromisoformat(str(snapshot_date)[:10]).replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+    return headers
+
+
+def payload_headers(payload: Any, cache_control_value: str = cache_control()) -> dict:
+    """Validator and caching headers for a payload that has no snapshot date."""
+    return {
+        "ETag": _weak_etag(orjson.dumps(payload)),
+        "Cache-Control": cache_control_value,
+        "Vary": "Accept-Encoding",
+    }
+
+
+def is_not_modified(request: Request, headers: dict) -> bool:
+    """True when the request's If-None-Match already names our ETag (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or headers["ETag"].removeprefix("W/") in tags
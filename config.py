@@ -0,0 +1,40 @@
+import os
+from functools import lru_cache
+from typing import Optional
+from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict
+
+
+class Settings(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    supabase_url: Optional[str] = None
+    supabase_key: Optional[str] = None
+    redis_url: Optional[str] = None
+    # Optional direct Postgres DSN for the hottest reads. Must point at the
+    # Supavisor transaction pooler (port 6543); kept small per worker.
+    database_url: Optional[str] = None
+    pg_pool_size: int = 5
+    # Per-worker HTTP pool to PostgREST. With HTTP/2 one connection multiplexes
+    # many requests, so a small pool suffices; keep workers x http_max_connections
+    # within what the project's gateway and pooler are sized for.
+    http_max_connections: int = 20
+    http_max_keepalive: int = 20
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Environment settings, read (and .env loaded) on first use rather than at import.
+    Tests can patch the environment and call get_settings.cache_clear().
+    """
+    load_dotenv()
+    return Settings(
+        supabase_url=os.getenv("SUPABASE_URL"),
+        supabase_key=os.getenv("SUPABASE_KEY"),
+        redis_url=os.getenv("REDIS_URL"),
+        database_url=os.getenv("DATABASE_URL"),
+        pg_pool_size=int(os.getenv("PG_POOL_SIZE", "5")),
+        http_max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "20")),
+        http_max_keepalive=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+    )
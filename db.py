@@ -0,0 +1,155 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+from asyncpg import Pool
+from fastapi import Request
+from postgrest import AsyncPostgrestClient
+
+# ─── Dependencies ───────────────────────────────────────────────────────────
+
+def get_supabase(request: Request) -> AsyncPostgrestClient:
+    """Dependency returning the shared async PostgREST client."""
+    return request.app.state.supabase
+
+
+def get_loaders(request: Request) -> "Loaders":
+    """Dependency returning the worker's shared batch loaders."""
+    return request.app.state.loaders
+
+
+def get_pg(request: Request) -> Optional[Pool]:
+    """Dependency returning the direct Postgres pool, or None when DATABASE_URL is unset."""
+    return request.app.state.pg
+
+# ─── Column Projections ─────────────────────────────────────────────────────
+#
+# List endpoints select only the columns the frontend renders instead of "*".
+# Detail endpoints (profiles, head-to-head) keep the full stats row but embed
+# compact player cards, since the nested players(*) bios are the bulk.
+
+PLAYER_CARD_COLUMNS = "slug,name,image_url,country"
+PLAYER_STATS_COLUMNS = "slug,snapshot_date,points,rank,points_change"
+PAIR_STATS_COLUMNS = "pair_slug,snapshot_date,points,rank,points_change"
+MATCH_COLUMNS = "id,date,round_name,winner_team,score,team1_slug,team2_slug,tournament_id"
+PAIR_PLAYERS_EMBED = (
+    f"player1:players!player1_slug({PLAYER_CARD_COLUMNS}),"
+    f"player2:players!player2_slug({PLAYER_CARD_COLUMNS})"
+)
+
+# ─── Query Helpers ──────────────────────────────────────────────────────────
+#
+# Search terms are matched with ILIKE '%term%'. User-supplied % and _ are
+# escaped so they match literally instead of turning the pattern into a
+# table-wide wildcard, and terms shorter than MIN_SEARCH_LENGTH are rejected
+# (one character matches almost every row and defeats the trigram indexes).
+
+MIN_SEARCH_LENGTH = 2
+
+
+def payload_snapshot(rows: list) -> Optional[str]:
+    """snapshot_date of a payload read from a *_latest view (None when empty)."""
+    return rows[0]["snapshot_date"] if rows else None
+
+
+def cursor_page(rows: list, limit: int, cursor: Callable[[dict], Any]) -> dict:
+    """Wrap a keyset-ordered page with `cursor(last_row)` for the next one (None on the last page)."""
+    return {"data": rows, "next_cursor": cursor(rows[-1]) if len(rows) == limit else None}
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE metacharacters so `term` matches literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def ilike_pattern(term: str) -> str:
+    """'%term%' for a PostgREST ilike filter, which also reads '*' as a wildcard."""
+    return f"%{escape_like(term.replace('*', ''))}%"
+
+# ─── Batch Loaders ──────────────────────────────────────────────────────────
+#
+# Dashboards fan out one request per player/pair (e.g. /players/{slug} for the
+# whole ranking). Single-row lookups arriving within BATCH_WINDOW seconds are
+# coalesced into one `in.(...)` query, DataLoader-style, so N requests cost
+# one Supabase round trip instead of N. "Latest row per slug" lookups read the
+# DISTINCT ON views players_latest_stats / pairs_latest_profile.
+
+BATCH_WINDOW = 0.005
+
+
+class BatchLoader:
+    """Coalesce `load(key)` calls into one `batch_fn(keys) -> {key: row}` call."""
+
+    def __init__(self, batch_fn: Callable[[list], Awaitable[dict]], window: float = BATCH_WINDOW, max_batch: int = 100):
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def load(self, key: str) -> Optional[dict]:
+        loop = asyncio.get_running_loop()
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        # Shielded: the future is shared by every caller asking for this key.
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict) -> None:
+        try:
+            rows = await self.batch_fn(list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(rows.get(key))
+
+
+class Loaders:
+    """Per-worker batch loaders for player profiles, latest player stats and latest pair stats."""
+
+    def __init__(self, supabase: AsyncPostgrestClient):
+        self.supabase = supabase
+        self.profiles = BatchLoader(self._load_profiles)
+        self.player_stats = BatchLoader(self._load_player_stats)
+        self.pair_stats = BatchLoader(self._load_pair_stats)
+
+    async def _load_profiles(self, slugs: list) -> dict:
+        # One request for the static rows and each player's newest
+        # dynamic_players row; the embedded order/limit apply per player.
+        res = await self.supabase.table("players") \
+            .select("*,dynamic_players(*)") \
+            .in_("slug", slugs) \
+            .order("snapshot_date", desc=True, foreign_table="dynamic_players") \
+            .limit(1, foreign_table="dynamic_players") \
+            .execute()
+        profiles = {}
+        for row in res.data:
+            history = row.pop("dynamic_players")
+            profiles[row["slug"]] = {"profile": row, "current_stats": history[0] if history else None}
+        return profiles
+
+    async def _load_player_stats(self, slugs: list) -> dict:
+        return await self._load_rows("players_latest_stats", "slug", f"*,players({PLAYER_CARD_COLUMNS})", slugs)
+
+    async def _load_pair_stats(self, pair_slugs: list) -> dict:
+        return await self._load_rows("pairs_latest_profile", "pair_slug", f"*,{PAIR_PLAYERS_EMBED}", pair_slugs)
+
+    async def _load_rows(self, table: str, key_column: str, columns: str, keys: list) -> dict:
+        res = await self.supabase.table(table).select(columns).in_(key_column, keys).execute()
+        return {row[key_column]: row for row in res.data}
@@ -0,0 +1,54 @@
+from datetime import date
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+# ─── Pydantic Models ────────────────────────────────────────────────────────
+
+class PlayerStats(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+    slug: str
+    name: str
+    points: int
+    rank: int
+    partner: Optional[str] = None
+
+class PlayerCard(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+    slug: str
+    name: str
+    image_url: Optional[str] = None
+    country: Optional[str] = None
+
+class PlayerPage(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+    data: list[PlayerCard]
+    next_cursor: Optional[str] = None
+
+class MatchSchema(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+    id: int
+    date: date
+    round_name: Optional[str] = None
+    winner_team: Optional[int] = None
+    score: Optional[str] = None
+    team1_slug: str
+    team2_slug: str
+    tournament_id: Optional[int] = None
+
+class MatchPage(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+    data: list[MatchSchema]
+    next_cursor: Optional[str] = None
+
+class SearchResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+    type: str
+    slug: Optional[str] = None
+    id: Optional[str] = None
+    label: str
@@ -0,0 +1,66 @@
+from typing import Optional
+import orjson
+from asyncpg import Pool
+from fastapi import APIRouter, Depends, Query, Request, Response
+from postgrest import AsyncPostgrestClient
+from cache import cached, is_not_modified, snapshot_headers
+from db import MIN_SEARCH_LENGTH, PLAYER_STATS_COLUMNS, escape_like, get_pg, get_supabase, payload_snapshot
+from models import SearchResult
+
+# ─── Analytics ──────────────────────────────────────────────────────────────
+
+router = APIRouter(tags=["Analytics"])
+
+TRENDING_TTL = 600
+
+
+async def _trending_players(supabase: AsyncPostgrestClient, limit: int) -> list:
+    res = await supabase.table("trending_players_latest") \
+        .select(f"{PLAYER_STATS_COLUMNS},name").order("points_change", desc=True).limit(limit).execute()
+    return res.data
+
+
+@router.get("/analytics/trending")
+async def get_trending_players(request: Request, response: Response, limit: int = Query(10, ge=1, le=100), supabase: AsyncPostgrestClient = Depends(get_supabase)):
+    """
+    Top `limit` players (default 10, up to 100) with the biggest positive points
+    change in the latest snapshot, with their names.
+    Read from the trending_players_latest materialized view (refreshed daily).
+    """
+    rows = await cached(("trending", "players", limit), lambda: _trending_players(supabase, limit), ttl=TRENDING_TTL)
+    headers = snapshot_headers(payload_snapshot(rows), "trending", limit, ttl=TRENDING_TTL)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return rows
+
+
+SEARCH_TTL = 60
+
+
+async def _global_search(supabase: AsyncPostgrestClient, pg: Optional[Pool], q: str, per_type: Optional[int]) -> list:
+    if pg is not None:
+        if per_type is None:
+            result = await pg.fetchval("select public.global_search($1)", escape_like(q))
+        else:
+            result = await pg.fetchval("select public.global_search($1, $2, $2, $2)", escape_like(q), per_type)
+        return orjson.loads(result)
+    params = {"q": escape_like(q)}
+    if per_type is not None:
+        params.update(player_limit=per_type, pair_limit=per_type, tour_limit=per_type)
+    res = await supabase.rpc("global_search", params, get=True).execute()
+    return res.data
+
+
+@router.get("/search", response_model=list[SearchResult], response_model_exclude_unset=True)
+async def global_search(q: str, per_type: Optional[int] = Query(None, ge=1, le=10), supabase: AsyncPostgrestClient = Depends(get_supabase), pg: Optional[Pool] = Depends(get_pg)):
+    """
+    Search players, pairs, and tournaments in one round trip (global_search RPC).
+    The term is normalized (trimmed, lower-cased) so type-ahead variants share a cache entry;
+    terms shorter than MIN_SEARCH_LENGTH return no results without a query.
+    ?per_type= caps the results of each type (default: 5 players, 5 pairs, 3 tournaments).
+    """
+    q = q.strip().lower()
+    if len(q) < MIN_SEARCH_LENGTH:
+        return []
+    return await cached(("search", q, per_type), lambda: _global_search(supabase, pg, q, per_type), ttl=SEARCH_TTL)
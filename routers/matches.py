@@ -0,0 +1,99 @@
+import asyncio
+from datetime import date
+from typing import AsyncIterator, Literal, Optional
+import orjson
+from asyncpg import Pool
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from postgrest import AsyncPostgrestClient
+from db import MATCH_COLUMNS, cursor_page, get_pg, get_supabase
+from models import MatchPage
+
+# ─── Matches ────────────────────────────────────────────────────────────────
+#
+# Pair slugs don't contain '/', so plain {pair1}/{pair2} works fine.
+# No :path modifier needed.
+
+router = APIRouter(prefix="/matches", tags=["Matches"])
+
+
+def _match_cursor(row: dict) -> str:
+    return f"{row['date']},{row['id']}"
+
+
+def _parse_match_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        day, match_id = cursor.split(",")
+        return date.fromisoformat(day), int(match_id)
+    except ValueError:
+        raise HTTPException(400, detail="Invalid cursor") from None
+
+
+STREAM_PAGE_SIZE = 500
+
+
+def _matches_query(supabase: AsyncPostgrestClient, tournament_id: Optional[int], date_from: Optional[date], after: Optional[tuple]):
+    query = supabase.table("matches").select(MATCH_COLUMNS)
+    if tournament_id:
+        query = query.eq("tournament_id", tournament_id)
+    if date_from:
+        query = query.gte("date", date_from)
+    if after:
+        day, match_id = after
+        query = query.or_(f"date.lt.{day},and(date.eq.{day},id.lt.{match_id})")
+    return query.order("date", desc=True).order("id", desc=True)
+
+
+async def _stream_matches(supabase: AsyncPostgrestClient, tournament_id: Optional[int], date_from: Optional[date], after: Optional[tuple]) -> AsyncIterator[bytes]:
+    """Yield every matching row as one NDJSON line, fetching STREAM_PAGE_SIZE rows at a time."""
+    while True:
+        res = await _matches_query(supabase, tournament_id, date_from, after).limit(STREAM_PAGE_SIZE).execute()
+        for row in res.data:
+            yield orjson.dumps(row) + b"\n"
+        if len(res.data) < STREAM_PAGE_SIZE:
+            return
+        after = (res.data[-1]["date"], res.data[-1]["id"])
+
+
+@router.get("", response_model=MatchPage)
+async def get_matches(limit: int = Query(20, ge=1, le=100), tournament_id: Optional[int] = None, date_from: Optional[date] = None, cursor: Optional[str] = None, format: Literal["json", "ndjson"] = "json", supabase: AsyncPostgrestClient = Depends(get_supabase)):
+    """
+    List matches with optional filters, newest first.
+    Keyset-paginated on (date, id): pass the returned next_cursor as ?cursor= to
+    fetch the following page. With ?format=ndjson, every match after the cursor is
+    streamed as newline-delimited JSON instead (limit is ignored), so bulk consumers
+    get the first rows after one round trip and the API never holds the full set.
+    """
+    after = _parse_match_cursor(cursor) if cursor else None
+    if format == "ndjson":
+        return StreamingResponse(_stream_matches(supabase, tournament_id, date_from, after), media_type="application/x-ndjson")
+    res = await _matches_query(supabase, tournament_id, date_from, after).limit(limit).execute()
+    return cursor_page(res.data, limit, _match_cursor)
+
+
+async def _head_to_head_summary(supabase: AsyncPostgrestClient, pg: Optional[Pool], pair1: str, pair2: str) -> dict:
+    if pg is not None:
+        return dict(await pg.fetchrow("select * from public.head_to_head_summary($1, $2)", pair1, pair2))
+    res = await supabase.rpc("head_to_head_summary", {"p1": pair1, "p2": pair2}, get=True).execute()
+    return res.data[0]
+
+
+@router.get("/{pair1}/{pair2}")
+async def get_matches_head_to_head(pair1: str, pair2: str, include_history: bool = False, limit: int = Query(50, ge=1, le=200), supabase: AsyncPostgrestClient = Depends(get_supabase), pg: Optional[Pool] = Depends(get_pg)):
+    """
+    Win summary between two pairs/teams, tallied in Postgres (head_to_head_summary).
+    Match history (head_to_head RPC, newest first, each row flagged with a_won
+    for pair1) is only returned with ?include_history=true, capped at `limit` rows.
+    """
+    summary_query = _head_to_head_summary(supabase, pg, pair1, pair2)
+    if include_history:
+        row, history = await asyncio.gather(
+            summary_query,
+            supabase.rpc("head_to_head", {"a": pair1, "b": pair2, "max_rows": limit}, get=True).execute(),
+        )
+    else:
+        row, history = await summary_query, None
+    result = {"summary": {pair1: row["wins_p1"], pair2: row["wins_p2"], "total_matches": row["total"]}}
+    if history is not None:
+        result["history"] = history.data
+    return result
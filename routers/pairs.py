@@ -0,0 +1,85 @@
+import asyncio
+from datetime import date
+from operator import itemgetter
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from postgrest import AsyncPostgrestClient
+from cache import cached, is_not_modified, snapshot_headers
+from db import PAIR_PLAYERS_EMBED, PAIR_STATS_COLUMNS, Loaders, get_loaders, get_supabase, cursor_page, payload_snapshot
+
+# ─── Pairs ──────────────────────────────────────────────────────────────────
+#
+# Pair slugs use '--' (double dash) as separator and NEVER contain '/'.
+# Therefore we use plain {pair_slug} (single-segment) instead of {slug:path},
+# which eliminates all catch-all conflicts.
+#
+# ORDER:
+#   /pairs/head-to-head       → query params, fixed path, FIRST
+#   /pairs/{pair_slug}/evolution → 3 segments, before /{pair_slug}
+#   /pairs/{pair_slug}        → 2 segments, LAST (catch-all)
+
+router = APIRouter(prefix="/pairs", tags=["Pairs"])
+
+
+async def _pairs_ranking(supabase: AsyncPostgrestClient, limit: int) -> list:
+    res = await supabase.table("dynamic_pairs_latest") \
+        .select(f"{PAIR_STATS_COLUMNS},{PAIR_PLAYERS_EMBED}") \
+        .order("points", desc=True) \
+        .limit(limit).execute()
+    return res.data
+
+
+@router.get("")
+async def get_pairs_ranking(request: Request, response: Response, limit: int = Query(20, ge=1, le=100), supabase: AsyncPostgrestClient = Depends(get_supabase)):
+    """Pair ranking from the dynamic_pairs_latest view (latest snapshot)."""
+    rows = await cached(("ranking", "pairs", limit), lambda: _pairs_ranking(supabase, limit))
+    headers = snapshot_headers(payload_snapshot(rows), "pairs", limit)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return rows
+
+
+@router.get("/head-to-head")
+async def get_pairs_head_to_head(slug1: str = Query(...), slug2: str = Query(...), loaders: Loaders = Depends(get_loaders)):
+    """
+    Compare two pairs via dynamic_pairs stats.
+    Uses query params (?slug1=&slug2=) to avoid conflicting with /{pair_slug}.
+    NOTE: defined before /pairs/{pair_slug} to avoid route shadowing.
+    """
+    p1, p2 = await asyncio.gather(loaders.pair_stats.load(slug1), loaders.pair_stats.load(slug2))
+    if p1 is None:
+        raise HTTPException(404, detail=f"Pair '{slug1}' not found")
+    if p2 is None:
+        raise HTTPException(404, detail=f"Pair '{slug2}' not found")
+    return {
+        "snapshot_date": p1.get("snapshot_date"),
+        "pair1": p1,
+        "pair2": p2
+    }
+
+
+@router.get("/{pair_slug}/evolution")
+async def get_pair_evolution(pair_slug: str, limit: int = Query(200, ge=1, le=500), after: Optional[date] = None, supabase: AsyncPostgrestClient = Depends(get_supabase)):
+    """
+    Point/ranking history for a pair, oldest first, `limit` snapshots per page.
+    Pass the returned next_cursor as ?after= to fetch the following page.
+    NOTE: defined before /pairs/{pair_slug} to avoid route shadowing.
+    """
+    query = supabase.table("dynamic_pairs").select("*").eq("pair_slug", pair_slug)
+    if after:
+        query = query.gt("snapshot_date", after)
+    res = await query.order("snapshot_date", desc=False).limit(limit).execute()
+    return cursor_page(res.data, limit, itemgetter("snapshot_date"))
+
+
+@router.get("/{pair_slug}")
+async def get_pair_profile(pair_slug: str, loaders: Loaders = Depends(get_loaders)):
+    """
+    Pair profile: the pair's most recent dynamic_pairs row (pairs_latest_profile view).
+    LAST pair route (catch-all).
+    """
+    pair = await loaders.pair_stats.load(pair_slug)
+    if pair is None:
+        raise HTTPException(404, detail="Pair not found")
+    return pair
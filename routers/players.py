@@ -0,0 +1,132 @@
+import asyncio
+from datetime import date
+from operator import itemgetter
+from typing import Optional
+import orjson
+from asyncpg import Pool
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from postgrest import AsyncPostgrestClient
+from cache import cached, is_not_modified, snapshot_headers
+from db import (
+    MIN_SEARCH_LENGTH, PLAYER_CARD_COLUMNS, PLAYER_STATS_COLUMNS, Loaders, cursor_page, get_loaders,
+    get_pg, get_supabase, ilike_pattern, payload_snapshot,
+)
+from models import PlayerPage
+
+# ─── Players ────────────────────────────────────────────────────────────────
+#
+# ORDER MATTERS: specific routes must come before generic /{slug} catch-all.
+#
+#   /players/ranking                          → 2 fixed segments
+#   /players/headtohead/{player1}/{player2}   → 4 segments, before /{slug}
+#   /players/{slug}/evolution                 → 3 segments, before /{slug}
+#   /players/{slug}                           → 2 segments, LAST (catch-all)
+
+router = APIRouter(prefix="/players", tags=["Players"])
+
+
+@router.get("", response_model=PlayerPage)
+async def get_players(after: Optional[str] = None, limit: int = Query(20, ge=1, le=100), search: Optional[str] = None, supabase: AsyncPostgrestClient = Depends(get_supabase)):
+    """
+    List player cards from the static players table, ordered by slug. Supports name
+    search (at least MIN_SEARCH_LENGTH characters, matched literally).
+    Keyset-paginated: pass the returned next_cursor as ?after= to fetch the following page.
+    """
+    query = supabase.table("players").select(PLAYER_CARD_COLUMNS)
+    if search is not None:
+        # Drop '*' (a PostgREST wildcard) before the length check, so '**' or 'a*'
+        # cannot slip through as a match-everything or one-character pattern.
+        search = search.replace("*", "").strip()
+        if len(search) < MIN_SEARCH_LENGTH:
+            return {"data": [], "next_cursor": None}
+        query = query.ilike("name", ilike_pattern(search))
+    if after:
+        query = query.gt("slug", after)
+    res = await query.order("slug").limit(limit).execute()
+    return cursor_page(res.data, limit, itemgetter("slug"))
+
+# Same rows and shape as the PostgREST select below, built as one JSON value in
+# Postgres so the direct path is a single fetchval.
+_PLAYERS_RANKING_SQL = """
+select coalesce(json_agg(r order by r.points desc), '[]')
+  from (select d.slug, d.snapshot_date, d.points, d.rank, d.points_change,
+               (select json_build_object('slug', p.slug, 'name', p.name,
+                                         'image_url', p.image_url, 'country', p.country)
+                  from public.players p
+                 where p.slug = d.slug) as players
+          from public.dynamic_players_latest d
+         order by d.points desc
+         limit $1) r
+"""
+
+
+async def _players_ranking(supabase: AsyncPostgrestClient, pg: Optional[Pool], limit: int) -> list:
+    if pg is not None:
+        return orjson.loads(await pg.fetchval(_PLAYERS_RANKING_SQL, limit))
+    res = await supabase.table("dynamic_players_latest") \
+        .select(f"{PLAYER_STATS_COLUMNS},players({PLAYER_CARD_COLUMNS})") \
+        .order("points", desc=True) \
+        .limit(limit) \
+        .execute()
+    return res.data
+
+
+@router.get("/ranking")
+async def get_players_ranking(request: Request, response: Response, limit: int = Query(50, ge=1, le=200), supabase: AsyncPostgrestClient = Depends(get_supabase), pg: Optional[Pool] = Depends(get_pg)):
+    """
+    Official ranking from the dynamic_players_latest view (latest snapshot, ordered by points).
+    The ETag is derived from the snapshot_date of the rows being served.
+    No s-maxage: a cache invalidation cannot purge a CDN, so max-age=300 bounds
+    how long a new snapshot stays hidden there; revalidating a stale copy is a 304.
+    """
+    rows = await cached(("ranking", "players", limit), lambda: _players_ranking(supabase, pg, limit))
+    headers = snapshot_headers(payload_snapshot(rows), "ranking", limit)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return rows
+
+
+@router.get("/headtohead/{player1}/{player2}")
+async def get_players_head_to_head(player1: str, player2: str, loaders: Loaders = Depends(get_loaders)):
+    """
+    Compare two players using their latest dynamic_players stats.
+    NOTE: defined before /players/{slug} to avoid route shadowing.
+    """
+    p1, p2 = await asyncio.gather(loaders.player_stats.load(player1), loaders.player_stats.load(player2))
+    if p1 is None:
+        raise HTTPException(404, detail=f"Player '{player1}' not found")
+    if p2 is None:
+        raise HTTPException(404, detail=f"Player '{player2}' not found")
+    return {"player1": p1, "player2": p2}
+
+
+@router.get("/{slug}/evolution")
+async def get_player_evolution(slug: str, limit: int = Query(200, ge=1, le=500), after: Optional[date] = None, supabase: AsyncPostgrestClient = Depends(get_supabase)):
+    """
+    Point/ranking history for a player, oldest first, `limit` snapshots per page.
+    Pass the returned next_cursor as ?after= to fetch the following page.
+    NOTE: defined before /players/{slug} to avoid route shadowing.
+    """
+    query = supabase.table("dynamic_players").select("*").eq("slug", slug)
+    if after:
+        query = query.gt("snapshot_date", after)
+    check, res = await asyncio.gather(
+        supabase.table("players").select("slug").eq("slug", slug).execute(),
+        query.order("snapshot_date", desc=False).limit(limit).execute(),
+    )
+    if not check.data:
+        raise HTTPException(404, detail="Player not found")
+    return cursor_page(res.data, limit, itemgetter("snapshot_date"))
+
+
+@router.get("/{slug}")
+async def get_player_profile(slug: str, loaders: Loaders = Depends(get_loaders)):
+    """
+    Static profile + latest dynamic stats, fetched together as one embedded select.
+    LAST player route (catch-all).
+    """
+    profile = await loaders.profiles.load(slug)
+    if profile is None:
+        raise HTTPException(404, detail="Player not found")
+    return profile
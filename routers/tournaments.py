@@ -0,0 +1,45 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Request, Response
+from postgrest import AsyncPostgrestClient
+from cache import cache_control, cached, is_not_modified, payload_headers
+from db import get_supabase
+
+# ─── Tournaments ────────────────────────────────────────────────────────────
+
+router = APIRouter(prefix="/tournaments", tags=["Tournaments"])
+
+TOURNAMENTS_TTL = 3600
+# Past seasons are immutable, so CDNs may keep them for a day (s-maxage).
+# The current season changes as results land; browsers and CDNs both keep
+# it for 10 minutes, as does our own cache, so none outlives the others.
+PAST_YEAR_EDGE_TTL = 86400
+CURRENT_YEAR_TTL = 600
+
+
+async def _tournaments(supabase: AsyncPostgrestClient, year: int) -> list:
+    res = await supabase.table("tournaments") \
+        .select("*") \
+        .gte("start_date", f"{year}-01-01") \
+        .lte("start_date", f"{year}-12-31") \
+        .order("start_date", desc=False).execute()
+    return res.data
+
+
+@router.get("")
+async def get_tournaments(request: Request, response: Response, year: int = 2025, supabase: AsyncPostgrestClient = Depends(get_supabase)):
+    """
+    Tournaments starting in `year`. Past seasons are cacheable at the edge for a
+    day (s-maxage); the current season for 10 minutes, in browsers and at the edge.
+    """
+    past = year < date.today().year
+    ttl = TOURNAMENTS_TTL if past else CURRENT_YEAR_TTL
+    rows = await cached(("tournaments", year), lambda: _tournaments(supabase, year), ttl=ttl)
+    if past:
+        policy = cache_control(ttl, shared_ttl=PAST_YEAR_EDGE_TTL, stale=3600)
+    else:
+        policy = cache_control(ttl, shared_ttl=ttl)
+    headers = payload_headers(rows, policy)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return rows
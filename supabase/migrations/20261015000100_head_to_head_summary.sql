@@ -0,0 +1,28 @@
+-- Win tally between two pairs/teams, computed in the database so
+-- GET /matches/{pair1}/{pair2} no longer ships every match row to the API.
+
+create or replace function public.head_to_head_summary(p1 text, p2 text)
+returns table (wins_p1 int, wins_p2 int, total int)
+language sql
+stable
+as $$
+  select
+    count(*) filter (
+      where (team1_slug = p1 and winner_team = 1)
+         or (team2_slug = p1 and winner_team = 2)
+    )::int as wins_p1,
+    count(*) filter (
+      where (team1_slug = p2 and winner_team = 1)
+         or (team2_slug = p2 and winner_team = 2)
+    )::int as wins_p2,
+    count(*)::int as total
+  from public.matches
+  where (team1_slug = p1 and team2_slug = p2)
+     or (team1_slug = p2 and team2_slug = p1);
+$$;
+
+-- Backs both the function above and the history query.
+-- On a large live table, run this by hand with CREATE INDEX CONCURRENTLY
+-- (it cannot run inside the migration transaction).
+create index if not exists matches_team_slugs_idx
+  on public.matches (team1_slug, team2_slug, date desc);
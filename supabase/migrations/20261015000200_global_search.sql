@@ -0,0 +1,34 @@
+-- Trigram indexes let the leading-wildcard ILIKE '%q%' searches use an index
+-- instead of scanning players, dynamic_pairs and tournaments in full.
+
+create extension if not exists pg_trgm with schema extensions;
+
+create index if not exists players_name_trgm
+  on public.players using gin (name extensions.gin_trgm_ops);
+create index if not exists dynamic_pairs_pair_slug_trgm
+  on public.dynamic_pairs using gin (pair_slug extensions.gin_trgm_ops);
+create index if not exists tournaments_full_name_trgm
+  on public.tournaments using gin (full_name extensions.gin_trgm_ops);
+
+-- GET /search in one round trip. Tournament rows carry their id in `slug`.
+create or replace function public.global_search(q text)
+returns table (type text, slug text, label text)
+language sql
+stable
+as $$
+  (select 'player', p.slug, p.name
+     from public.players p
+    where p.name ilike '%' || q || '%'
+    limit 5)
+  union all
+  (select 'pair_slug', d.pair_slug, d.pair_slug
+     from (select distinct pair_slug
+             from public.dynamic_pairs
+            where pair_slug ilike '%' || q || '%') d
+    limit 5)
+  union all
+  (select 'tournament', t.tournaments_id::text, t.full_name
+     from public.tournaments t
+    where t.full_name ilike '%' || q || '%'
+    limit 3);
+$$;
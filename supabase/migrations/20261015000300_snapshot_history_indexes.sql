@@ -0,0 +1,8 @@
+-- Equality column first, range/order column last: backs both the paginated
+-- evolution queries and the "latest row per slug" lookups.
+-- On large live tables, build these by hand with CREATE INDEX CONCURRENTLY.
+
+create index if not exists dynamic_players_slug_date_idx
+  on public.dynamic_players (slug, snapshot_date desc);
+create index if not exists dynamic_pairs_pair_slug_date_idx
+  on public.dynamic_pairs (pair_slug, snapshot_date desc);
@@ -0,0 +1,26 @@
+-- Top-10 trending players of the latest snapshot, precomputed so
+-- GET /analytics/trending reads ten rows instead of filtering and sorting
+-- dynamic_players on every request.
+
+create materialized view if not exists public.trending_players_latest as
+select dp.slug, dp.snapshot_date, dp.points, dp.rank, dp.points_change
+  from public.dynamic_players dp
+ where dp.snapshot_date = (select max(snapshot_date) from public.dynamic_players)
+   and dp.points_change > 0
+ order by dp.points_change desc
+ limit 10;
+
+-- A unique index is required for REFRESH ... CONCURRENTLY.
+create unique index if not exists trending_players_latest_slug_idx
+  on public.trending_players_latest (slug);
+
+grant select on public.trending_players_latest to anon, authenticated;
+
+-- Refresh shortly after the daily snapshot ingestion (03:00 UTC).
+create extension if not exists pg_cron;
+
+select cron.schedule(
+  'refresh-trending',
+  '5 3 * * *',
+  $$refresh materialized view concurrently public.trending_players_latest$$
+);
@@ -0,0 +1,12 @@
+-- Backs GET /matches?tournament_id=... (filter on tournament_id, order by
+-- date desc). The "latest row per slug" lookups are covered by the
+-- (slug, snapshot_date desc) indexes from 20261015000300.
+--
+-- Check the plans switch from Seq Scan + Sort to Index Scan -> Limit:
+--   explain analyze select * from dynamic_players
+--    where slug = '<slug>' order by snapshot_date desc limit 1;
+--   explain analyze select * from matches
+--    where tournament_id = <id> order by date desc limit 20;
+
+create index if not exists matches_tournament_date_idx
+  on public.matches (tournament_id, date desc);
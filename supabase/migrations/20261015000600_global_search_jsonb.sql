@@ -0,0 +1,42 @@
+-- GET /search result objects built entirely in SQL: per-type limits and the
+-- pair label formatting (previously a Python loop) now happen server-side,
+-- and the function returns the final JSON array so the API passes it through.
+
+drop function if exists public.global_search(text);
+
+create or replace function public.global_search(
+  q text,
+  player_limit int default 5,
+  pair_limit int default 5,
+  tour_limit int default 3
+)
+returns jsonb
+language sql
+stable
+as $$
+  select coalesce(jsonb_agg(r.item order by r.grp), '[]'::jsonb)
+    from (
+      (select 1 as grp,
+              jsonb_build_object('type', 'player', 'slug', p.slug, 'label', p.name) as item
+         from public.players p
+        where p.name ilike '%' || q || '%'
+        limit player_limit)
+      union all
+      (select 2,
+              jsonb_build_object(
+                'type', 'pair_slug',
+                'slug', d.pair_slug,
+                'label', initcap(replace(replace(d.pair_slug, '--', ' / '), '-', ' '))
+              )
+         from (select distinct pair_slug
+                 from public.dynamic_pairs
+                where pair_slug ilike '%' || q || '%') d
+        limit pair_limit)
+      union all
+      (select 3,
+              jsonb_build_object('type', 'tournament', 'id', t.tournaments_id::text, 'label', t.full_name)
+         from public.tournaments t
+        where t.full_name ilike '%' || q || '%'
+        limit tour_limit)
+    ) r;
+$$;
@@ -0,0 +1,16 @@
+-- Most recent row per player / pair, so "latest stats for this slug" is a
+-- single query instead of a snapshot-date probe followed by a filtered read.
+-- DISTINCT ON uses the (slug, snapshot_date desc) indexes and the slug
+-- filter is pushed down into the view.
+
+create or replace view public.players_latest_stats
+  with (security_invoker = on) as
+select distinct on (slug) *
+  from public.dynamic_players
+ order by slug, snapshot_date desc;
+
+create or replace view public.pairs_latest_profile
+  with (security_invoker = on) as
+select distinct on (pair_slug) *
+  from public.dynamic_pairs
+ order by pair_slug, snapshot_date desc;
@@ -0,0 +1,17 @@
+-- Every row of the most recent snapshot, so the ranking endpoints read the
+-- current snapshot in one request instead of probing max(snapshot_date)
+-- first and filtering by it in a second round trip. The scalar subquery is
+-- evaluated once per statement; with an index led by snapshot_date it is a
+-- single index probe.
+
+create or replace view public.dynamic_players_latest
+  with (security_invoker = on) as
+select *
+  from public.dynamic_players
+ where snapshot_date = (select max(snapshot_date) from public.dynamic_players);
+
+create or replace view public.dynamic_pairs_latest
+  with (security_invoker = on) as
+select *
+  from public.dynamic_pairs
+ where snapshot_date = (select max(snapshot_date) from public.dynamic_pairs);
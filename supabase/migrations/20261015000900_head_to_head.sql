@@ -0,0 +1,26 @@
+-- Match history between two pairs/teams with a per-row a_won flag.
+-- The previous history query filtered team1_slug and team2_slug with the
+-- same IN list, which also matched a team playing itself. This uses the
+-- same OR predicate as head_to_head_summary, served by
+-- matches_team_slugs_idx. Returns the final JSON array, newest first.
+
+create or replace function public.head_to_head(a text, b text)
+returns jsonb
+language sql
+stable
+as $$
+  select coalesce(
+           jsonb_agg(
+             to_jsonb(m) || jsonb_build_object(
+               'a_won',
+               ((m.team1_slug = a and m.winner_team = 1)
+                 or (m.team2_slug = a and m.winner_team = 2))::int
+             )
+             order by m.date desc
+           ),
+           '[]'::jsonb
+         )
+    from public.matches m
+   where (m.team1_slug = a and m.team2_slug = b)
+      or (m.team1_slug = b and m.team2_slug = a);
+$$;
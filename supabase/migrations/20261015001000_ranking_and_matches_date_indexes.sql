@@ -0,0 +1,17 @@
+-- The remaining hot predicates:
+--   * dynamic_players_latest / dynamic_pairs_latest compute max(snapshot_date)
+--     and then read that snapshot ordered by points desc. One index led by
+--     snapshot_date serves both the max() probe and the ordered ranking read.
+--   * GET /matches without a tournament filter orders by date desc.
+-- The per-slug, per-tournament, head-to-head and trigram search indexes
+-- already exist (20261015000100/000200/000300/000500).
+-- On large live tables, build these by hand with CREATE INDEX CONCURRENTLY.
+--
+--   explain analyze select * from dynamic_players_latest order by points desc limit 50;
+
+create index if not exists dynamic_players_snapshot_points_idx
+  on public.dynamic_players (snapshot_date desc, points desc);
+create index if not exists dynamic_pairs_snapshot_points_idx
+  on public.dynamic_pairs (snapshot_date desc, points desc);
+create index if not exists matches_date_idx
+  on public.matches (date desc);
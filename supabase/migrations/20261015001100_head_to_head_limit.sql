@@ -0,0 +1,26 @@
+-- Bound the head-to-head history payload: only the newest max_rows matches
+-- are returned (the API caps the value). Replaces head_to_head(text, text)
+-- so PostgREST resolves the call to a single function.
+
+drop function if exists public.head_to_head(text, text);
+
+create or replace function public.head_to_head(a text, b text, max_rows int default 50)
+returns jsonb
+language sql
+stable
+as $$
+  select coalesce(jsonb_agg(h.item order by h.date desc), '[]'::jsonb)
+    from (
+      select m.date,
+             to_jsonb(m) || jsonb_build_object(
+               'a_won',
+               ((m.team1_slug = a and m.winner_team = 1)
+                 or (m.team2_slug = a and m.winner_team = 2))::int
+             ) as item
+        from public.matches m
+       where (m.team1_slug = a and m.team2_slug = b)
+          or (m.team1_slug = b and m.team2_slug = a)
+       order by m.date desc
+       limit max_rows
+    ) h;
+$$;
@@ -0,0 +1,23 @@
+-- Widen trending_players_latest to the top 100 risers and carry the player
+-- name, so ?limit= up to 100 and the name join are served from the
+-- precomputed view instead of joining players per request. The nightly
+-- 'refresh-trending' cron job refreshes it by name and keeps working.
+
+drop materialized view if exists public.trending_players_latest;
+
+create materialized view public.trending_players_latest as
+select dp.slug, p.name, dp.snapshot_date, dp.points, dp.rank, dp.points_change
+  from public.dynamic_players dp
+  join public.players p on p.slug = dp.slug
+ where dp.snapshot_date = (select max(snapshot_date) from public.dynamic_players)
+   and dp.points_change > 0
+ order by dp.points_change desc
+ limit 100;
+
+-- A unique index is required for REFRESH ... CONCURRENTLY.
+create unique index trending_players_latest_slug_idx
+  on public.trending_players_latest (slug);
+create index trending_players_latest_points_change_idx
+  on public.trending_players_latest (points_change desc);
+
+grant select on public.trending_players_latest to anon, authenticated;